@@ -13,6 +13,8 @@ A minimal Streamlit app that:
 How to run locally:
 1) Install dependencies:
    pip install streamlit langchain langchain-openai openai tiktoken
+   (optional, faster keyword matching) pip install pyahocorasick
+   (optional, faster JSON parsing) pip install orjson
 
 2) Set your OpenAI API key (example for macOS/Linux):
    export OPENAI_API_KEY="your_openai_api_key"
@@ -23,23 +25,47 @@ How to run locally:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import re
+import shelve
+import string
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 import streamlit as st
 
-# LangChain + OpenAI (modern imports)
-try:
+# LangChain + OpenAI are imported lazily (see get_llm/request_reasons) so cold starts
+# without OPENAI_API_KEY never pay for loading them.
+if TYPE_CHECKING:
     from langchain_openai import ChatOpenAI
-    from langchain.prompts import ChatPromptTemplate
-    from langchain_core.output_parsers import StrOutputParser
+
+# Optional orjson for faster JSON (de)serialization; stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling is unchanged.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except Exception:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+# Optional Aho-Corasick automaton for single-pass keyword matching
+try:
+    import ahocorasick
 except Exception:
-    # Provide a helpful message if imports fail
-    ChatOpenAI = None  # type: ignore
-    ChatPromptTemplate = None  # type: ignore
-    StrOutputParser = None  # type: ignore
+    ahocorasick = None  # type: ignore
 
 
 # ---------- Config ----------
@@ -50,17 +76,25 @@ APP_CAPTION = "Enter what you want to buy. I’ll suggest the best sites and why
 DATA_DIR = Path("data")
 CATEGORIES_FILE = DATA_DIR / "categories.json"
 WEBSITES_FILE = DATA_DIR / "websites.json"
+LLM_CACHE_FILE = Path(".cache") / "llm_responses"  # shelve db, persists across sessions
+REASONS_TTL_SECONDS = 3600  # in-memory reasons cache lifetime
+REASONS_MEMO_MAX = 256      # in-memory reasons cache size cap
 
 DEFAULT_MODEL = "gpt-4o-mini"  # keep costs low; change to another supported model if needed
 TEMPERATURE = 0.2
 
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+TOKEN_CHARS = frozenset(string.ascii_lowercase + string.digits)
+PLURAL_SUFFIXES = ("", "s", "es")  # "laptops", "dresses" match "laptop", "dress"
+
+
 # ---------- Helpers ----------
 
 
 def load_json(path: Path) -> dict:
     """Load a JSON file and return a dict. Raises FileNotFoundError/JSONDecodeError on error."""
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    with path.open("rb") as f:
+        return json_loads(f.read())
 
 
 def build_keyword_index(categories_map: Dict[str, List[str]]) -> Dict[str, str]:
@@ -75,63 +109,228 @@ def build_keyword_index(categories_map: Dict[str, List[str]]) -> Dict[str, str]:
     return index
 
 
-def detect_category(query: str, categories_map: Dict[str, List[str]]) -> Optional[str]:
+def split_keyword_index(categories_map: Dict[str, List[str]]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Build the keyword->category lookups used by detect_category.
+    Returns (token_index, phrase_index): single-word keywords are matched by dict lookup,
+    multi-word/hyphenated ones (e.g. "gaming laptop", "t-shirt") by substring fallback.
+    """
+    index = build_keyword_index(categories_map)
+    token_index = {kw: cat for kw, cat in index.items() if TOKEN_RE.fullmatch(kw)}
+    phrase_index = {kw: cat for kw, cat in index.items() if kw not in token_index}
+    return token_index, phrase_index
+
+
+def build_keyword_automaton(categories_map: Dict[str, List[str]]):
+    """
+    Build an Aho-Corasick automaton over all keywords, each annotated with
+    (category, keyword, is_single_token).
+    Returns None if pyahocorasick is not installed or there are no keywords.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword, category in build_keyword_index(categories_map).items():
+        if keyword:
+            automaton.add_word(keyword, (category, keyword, bool(TOKEN_RE.fullmatch(keyword))))
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+def format_website_list(websites: List[Dict[str, str]]) -> str:
+    """Concise "- name: strengths" lines describing each website for the prompt."""
+    lines = []
+    for w in websites:
+        strengths = w.get("strengths", [])
+        strengths_txt = ", ".join(strengths) if strengths else "general strengths"
+        lines.append(f"- {w['name']}: {strengths_txt}")
+    return "\n".join(lines)
+
+
+@st.cache_resource(show_spinner=False)
+def bootstrap() -> SimpleNamespace:
+    """
+    Load datasets and build all derived lookups once per process (not per rerun).
+    cache_resource hands back the same object every time, so callers must not mutate it.
+    Raises FileNotFoundError/JSONDecodeError like load_json; errors are not cached.
+    """
+    categories_map = load_json(CATEGORIES_FILE)  # {category: [keywords]}
+    websites_map = load_json(WEBSITES_FILE)      # {category: [{name,url,strengths}, ...]}
+    return SimpleNamespace(
+        categories_map=categories_map,
+        websites_map=websites_map,
+        keyword_index=split_keyword_index(categories_map),
+        keyword_automaton=build_keyword_automaton(categories_map),
+        # Site lists are static per category, so their prompt text is too
+        website_list_text={cat: format_website_list(sites) for cat, sites in websites_map.items()},
+    )
+
+
+def automaton_hits(automaton, text: str) -> Dict[str, str]:
+    """
+    Keywords found in text by one automaton pass, as {keyword: category}.
+    Matches the token path exactly: single-word keywords must be whole tokens (plural
+    "s"/"es" allowed), multi-word keywords match as substrings.
+    """
+    hits: Dict[str, str] = {}
+    for end, (category, keyword, is_token) in automaton.iter(text):
+        if is_token:
+            start = end - len(keyword) + 1
+            if start > 0 and text[start - 1] in TOKEN_CHARS:
+                continue
+            for suffix in PLURAL_SUFFIXES:
+                after = end + 1 + len(suffix)
+                if text.startswith(suffix, end + 1) and (after >= len(text) or text[after] not in TOKEN_CHARS):
+                    break
+            else:
+                continue
+        hits[keyword] = category
+    return hits
+
+
+def token_hits(keyword_index: Tuple[Dict[str, str], Dict[str, str]], text: str) -> Dict[str, str]:
+    """Keywords found in text via the token/phrase indexes, as {keyword: category}."""
+    token_index, phrase_index = keyword_index
+    hits: Dict[str, str] = {}
+    for tok in TOKEN_RE.findall(text):
+        for suffix in PLURAL_SUFFIXES:
+            stem = tok[: len(tok) - len(suffix)]
+            if tok.endswith(suffix) and stem in token_index:
+                hits[stem] = token_index[stem]
+
+    for phrase, cat in phrase_index.items():
+        if phrase in text:
+            hits[phrase] = cat
+    return hits
+
+
+def detect_category(
+    query: str,
+    categories_map: Dict[str, List[str]],
+    keyword_index: Tuple[Dict[str, str], Dict[str, str]],
+    automaton=None,
+) -> Optional[str]:
     """
     Very simple keyword-based category detection.
-    - Lowercases query
-    - Checks if any keyword for a category is a substring of the query
-    Returns the first category with the highest keyword match count (basic tie-breaker).
+    - Lowercases the query and finds matching keywords: single words as whole tokens
+      (plurals like "laptops"/"dresses" included), multi-word keywords as substrings
+    - Uses one Aho-Corasick pass when the automaton is available, else the precomputed
+      token/phrase indexes; both give the same matches
+    Returns the category with the most distinct keyword matches (earlier category wins ties).
     """
     text = query.lower()
+    hits = automaton_hits(automaton, text) if automaton is not None else token_hits(keyword_index, text)
+    if not hits:
+        return None
+
+    scores = Counter(hits.values())
     best_cat = None
     best_score = 0
-
-    for category, keywords in categories_map.items():
-        score = sum(1 for kw in keywords if kw.lower() in text)
-        if score > best_score:
-            best_score = score
+    for category in categories_map:
+        if scores[category] > best_score:
+            best_score = scores[category]
             best_cat = category
+    return best_cat
+
 
-    return best_cat if best_score > 0 else None
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so equivalent queries share cache entries."""
+    return " ".join(query.lower().split())
 
 
-def ensure_llm() -> Optional[ChatOpenAI]:
+@st.cache_resource(show_spinner=False)
+def disk_cache_lock() -> threading.Lock:
+    """Process-wide lock for the shelve db; dbm files are not safe for concurrent writers."""
+    return threading.Lock()
+
+
+def disk_cache_get(prompt_text: str) -> Optional[str]:
+    """Return a previously stored raw LLM response for this exact prompt, if any."""
+    key = hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()
+    try:
+        with disk_cache_lock(), shelve.open(str(LLM_CACHE_FILE), flag="r") as db:
+            return db.get(key)
+    except Exception:
+        # Missing/locked/corrupt cache is never fatal; just call the model
+        return None
+
+
+def disk_cache_set(prompt_text: str, response: str) -> None:
+    """Persist a raw LLM response keyed on the SHA-256 of its prompt."""
+    key = hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()
+    try:
+        LLM_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with disk_cache_lock(), shelve.open(str(LLM_CACHE_FILE)) as db:
+            db[key] = response
+    except Exception:
+        pass
+
+
+@lru_cache(maxsize=1)
+def reasons_schema():
+    """
+    Build (on first use) the pydantic schema passed to with_structured_output.
+    A list of name/reason pairs rather than a free-form dict, because OpenAI's strict
+    JSON-schema mode does not accept arbitrary object keys.
+    """
+    from pydantic import BaseModel, Field
+
+    class SiteReason(BaseModel):
+        name: str = Field(description="Website name exactly as listed in the prompt")
+        reason: str = Field(description="One short sentence (<=22 words)")
+
+    class Reasons(BaseModel):
+        reasons: List[SiteReason]
+
+    return Reasons
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm() -> Optional[ChatOpenAI]:
     """
     Configure the LangChain OpenAI chat model if available and OPENAI_API_KEY is set.
+    Cached per process so its HTTP connection pool is reused across submits.
     Returns None if not configured (app will gracefully fall back).
     """
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
     if not api_key:
         return None
-    if ChatOpenAI is None:
-        return None
 
     # ChatOpenAI uses OPENAI_API_KEY from environment automatically
     try:
-        llm = ChatOpenAI(model=DEFAULT_MODEL, temperature=TEMPERATURE)
+        from langchain_openai import ChatOpenAI
+
+        llm = ChatOpenAI(model=DEFAULT_MODEL, temperature=TEMPERATURE, streaming=True)
         return llm
     except Exception:
         return None
 
 
-def generate_reasons_for_websites(
+def request_reasons(
     llm: ChatOpenAI,
     user_query: str,
     category: str,
     websites: List[Dict[str, str]],
+    on_partial: Optional[Callable[[Dict[str, str]], None]] = None,
+    website_list: Optional[str] = None,
 ) -> Dict[str, str]:
     """
-    Use the LLM to produce a short, tailored reason for each website.
-    Returns a dict {website_name: reason}. Falls back to basic reasons on any error.
+    Ask the LLM for a short, tailored reason for each website.
+    Output is schema-constrained (reasons_schema), so there is no free-text JSON to clean up.
+    If on_partial is given, the response is streamed and on_partial is called with the
+    reasons received so far (the last one may still be growing) whenever they change.
+    website_list is the precomputed prompt text for websites (see bootstrap); built here if omitted.
+    Returns a dict {website_name: reason}; sites the model skipped are missing.
+    Raises on any model error.
     """
-    # Build a concise description of each website for the prompt
-    website_lines = []
-    for w in websites:
-        strengths = w.get("strengths", [])
-        strengths_txt = ", ".join(strengths) if strengths else "general strengths"
-        website_lines.append(f"- {w['name']}: {strengths_txt}")
+    if website_list is None:
+        website_list = format_website_list(websites)
 
-    # Prompt instructs JSON-only output for easy parsing
+    from langchain_core.prompts import ChatPromptTemplate
+
+    Reasons = reasons_schema()
     prompt = ChatPromptTemplate.from_template(
         """You are a helpful shopping assistant.
 User's query: "{user_query}"
@@ -142,39 +341,115 @@ Below is a list of websites and their typical strengths. For EACH website, write
 Websites:
 {website_list}
 
-Output rules:
-- Return a VALID JSON object only, no markdown or extra text.
-- Keys MUST be exactly the website names from the list above.
-- Values are the one-sentence reasons.
-
-Example format:
-{
-  "Amazon India": "Reason here.",
-  "Flipkart": "Reason here."
-}"""
+Return the reasons keyed by website name, using the names exactly as listed above."""
     )
 
-    chain = prompt | llm | StrOutputParser()
+    # function_calling: its tools parser emits partial objects while streaming;
+    # the default json_schema parser only yields the final result.
+    chain = prompt | llm.with_structured_output(Reasons, method="function_calling")
+    inputs = {
+        "user_query": user_query,
+        "category": category,
+        "website_list": website_list,
+    }
+
+    allowed = {w["name"] for w in websites}
+    prompt_text = prompt.format(**inputs)
+    cached = disk_cache_get(prompt_text)
+    if cached is not None:
+        reasons = json_loads(cached)
+        if allowed <= reasons.keys():
+            return reasons
+
+    def to_dict(result) -> Dict[str, str]:
+        # Keep only known website names
+        return {r.name: r.reason for r in (result.reasons or []) if r.name in allowed and r.reason}
 
+    if on_partial is None:
+        result = chain.invoke(inputs)
+    else:
+        result, shown = None, {}
+        for chunk in chain.stream(inputs):
+            if not isinstance(chunk, Reasons):
+                continue
+            result = chunk
+            partial = to_dict(chunk)
+            if partial != shown:
+                shown = partial
+                on_partial(partial)
+        if result is None:
+            raise ValueError("Model returned no structured output.")
+
+    filtered = to_dict(result)
+    if allowed <= filtered.keys():
+        # Only complete answers are cached; a skipped site is retried next time
+        disk_cache_set(prompt_text, json_dumps(filtered))
+    return filtered
+
+
+@st.cache_resource(show_spinner=False)
+def reasons_memo() -> Tuple[Dict[tuple, Tuple[float, Dict[str, str]]], threading.Lock]:
+    """
+    Process-wide in-memory reasons cache: {(query_norm, category, sites_key): (stored_at, reasons)}.
+    A plain dict rather than st.cache_data, because reasons are streamed to the page while
+    they are generated and Streamlit calls must not run inside a cache_data function.
+    Every session thread shares it, so it comes with a lock that guards all access.
+    """
+    return {}, threading.Lock()
+
+
+def memo_get(key: tuple) -> Optional[Dict[str, str]]:
+    """Fresh cached reasons for key, or None."""
+    memo, lock = reasons_memo()
+    with lock:
+        entry = memo.get(key)
+    if entry is None or time.time() - entry[0] > REASONS_TTL_SECONDS:
+        return None
+    return dict(entry[1])
+
+
+def memo_set(key: tuple, reasons: Dict[str, str]) -> None:
+    """Store reasons for key, evicting the oldest entry once the cache is full."""
+    memo, lock = reasons_memo()
+    with lock:
+        memo[key] = (time.time(), dict(reasons))
+        if len(memo) > REASONS_MEMO_MAX:
+            oldest = min(memo, key=lambda k: memo[k][0])
+            memo.pop(oldest, None)
+
+
+def generate_reasons_for_websites(
+    llm: ChatOpenAI,
+    user_query: str,
+    category: str,
+    websites: List[Dict[str, str]],
+    on_partial: Optional[Callable[[Dict[str, str]], None]] = None,
+    website_list: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Use the LLM to produce a short, tailored reason for each website.
+    Results are memoized on (normalized query, category, site names) so reruns and repeated
+    queries skip the network; the prompt still gets the user's original query text.
+    on_partial (optional) receives reasons as they stream in on a cache miss.
+    Returns a dict {website_name: reason}. Falls back to basic reasons on any error,
+    and for any site the model skipped.
+    """
+    key = (normalize_query(user_query), category, tuple(sorted(w["name"] for w in websites)))
+    cached = memo_get(key)
+    if cached is not None:
+        return cached
     try:
-        raw = chain.invoke(
-            {
-                "user_query": user_query,
-                "category": category,
-                "website_list": "\n".join(website_lines),
-            }
-        )
-        # Parse JSON; if it fails, fall back
-        reasons = json.loads(raw)
-        if not isinstance(reasons, dict):
-            raise ValueError("Model did not return a JSON object.")
-        # Keep only known website names
-        allowed = {w["name"] for w in websites}
-        filtered = {k: str(v) for k, v in reasons.items() if k in allowed}
-        return filtered
+        reasons = request_reasons(llm, user_query, category, websites, on_partial, website_list)
     except Exception:
-        # Fallback deterministic reasons
+        # Fallback deterministic reasons (not memoized, so the next submit retries the LLM)
         return build_fallback_reasons(websites, category, user_query)
+    if all(w["name"] in reasons for w in websites):
+        memo_set(key, reasons)
+    else:
+        # Incomplete answer: fill the gaps, but don't memoize it so the next submit retries
+        for name, reason in build_fallback_reasons(websites, category, user_query).items():
+            reasons.setdefault(name, reason)
+    return reasons
 
 
 def build_fallback_reasons(
@@ -193,16 +468,29 @@ def build_fallback_reasons(
     return reasons
 
 
-def render_links_with_reasons(websites: List[Dict[str, str]], reasons: Dict[str, str]) -> None:
+def format_links_with_reasons(
+    websites: List[Dict[str, str]], reasons: Dict[str, str], pending: str = ""
+) -> str:
     """
-    Render a clean list of clickable links with short reasons.
+    Markdown bullet list of clickable links with short reasons.
+    Sites without a reason yet show `pending` instead.
     """
+    lines = []
     for w in websites:
         name = w["name"]
         url = w.get("url", "#")
-        reason = reasons.get(name, "").strip()
+        reason = reasons.get(name, "").strip() or pending
         # Clickable link + short reason
-        st.markdown(f"- [{name}]({url}) — {reason}")
+        lines.append(f"- [{name}]({url}) — {reason}")
+    return "\n".join(lines)
+
+
+def render_links_with_reasons(websites: List[Dict[str, str]], reasons: Dict[str, str], container=st) -> None:
+    """
+    Render a clean list of clickable links with short reasons as ONE markdown element
+    (one frontend message instead of one per site).
+    """
+    container.markdown(format_links_with_reasons(websites, reasons))
 
 
 # ---------- Streamlit UI ----------
@@ -234,8 +522,7 @@ if submit:
 
     # Load datasets
     try:
-        categories_map = load_json(CATEGORIES_FILE)  # {category: [keywords]}
-        websites_map = load_json(WEBSITES_FILE)      # {category: [{name,url,strengths}, ...]}
+        ctx = bootstrap()
     except FileNotFoundError as e:
         st.error(f"Dataset file missing: {e}")
         st.stop()
@@ -244,7 +531,7 @@ if submit:
         st.stop()
 
     # Detect category
-    category = detect_category(user_query, categories_map)
+    category = detect_category(user_query, ctx.categories_map, ctx.keyword_index, ctx.keyword_automaton)
     if not category:
         st.info(
             "I couldn't recognize the category from your query. "
@@ -253,7 +540,7 @@ if submit:
         st.stop()
 
     # Pull websites for this category
-    sites: List[Dict[str, str]] = websites_map.get(category, [])
+    sites: List[Dict[str, str]] = ctx.websites_map.get(category, [])
     if not sites:
         st.info(
             f"I found the category '{category}', but I don't have websites for it yet. "
@@ -261,23 +548,32 @@ if submit:
         )
         st.stop()
 
+    # Present results
+    st.subheader("🤖 Assistant’s suggestion")
+    st.write(
+        f"Based on your query, here are some good places to shop for {category}."
+    )
+
     # Generate reasons (LLM if available, else fallback)
-    llm = ensure_llm()
+    llm = get_llm()
     if llm is None:
         st.warning(
             "OPENAI_API_KEY not configured or LangChain OpenAI not available. "
             "Showing fallback reasons."
         )
+    live = st.empty()  # the whole link list renders into this one element
+    if llm is None:
         reasons = build_fallback_reasons(sites, category, user_query)
     else:
-        reasons = generate_reasons_for_websites(llm, user_query, category, sites)
+        # Show each reason as soon as the streamed response completes it
+        def show_partial(partial: Dict[str, str]) -> None:
+            live.markdown(format_links_with_reasons(sites, partial, pending="…"))
 
-    # Present results
-    st.subheader("🤖 Assistant’s suggestion")
-    st.write(
-        f"Based on your query, here are some good places to shop for {category}."
-    )
-    render_links_with_reasons(sites, reasons)
+        reasons = generate_reasons_for_websites(
+            llm, user_query, category, sites, show_partial, ctx.website_list_text.get(category)
+        )
+
+    render_links_with_reasons(sites, reasons, live)
 
     # Friendly hint
     st.caption(
@@ -7,28 +7,71 @@
 # 5) Show Assistant suggestion with clickable links
 # 6) Friendly error if category not recognized
 
+import asyncio
+import hashlib
 import json
 import os
 import re
-from typing import Dict, List, Optional, Tuple
+import shelve
+import string
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Pattern, Set, Tuple
 from urllib.parse import quote, urlparse  # for deep-link building
 
 import streamlit as st
 
-# Try to use LangChain + OpenAI if available and if OPENAI_API_KEY is set.
+# LangChain (langchain-openai) and the OpenAI SDK are imported lazily in get_llm /
+# get_openai_client, only once OPENAI_API_KEY is set, to keep cold starts fast.
+
+# Optional orjson for faster JSON parsing (pip install orjson); stdlib json otherwise.
 try:
-    from langchain_openai import ChatOpenAI  # Requires: langchain-openai
-    _lc_available = True
+    import orjson
+    _json_loads = orjson.loads
 except Exception:
-    _lc_available = False
+    _json_loads = json.loads
+
+# Optional Aho-Corasick automaton (pip install pyahocorasick); regex matching otherwise.
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
 
 
 # ---------- Config & Helpers ----------
 
+# One batched prompt for all sites by default. Set PER_SITE_REASONS=1 in the environment
+# to prompt per site instead (each call sees only its own deep link); those calls are
+# dispatched concurrently through LangChain.
+PER_SITE_REASONS = os.environ.get("PER_SITE_REASONS", "").strip().lower() in ("1", "true", "yes")
+
+# gpt-4o-mini is a good balance of cost/quality; adjust as you like.
+DEFAULT_MODEL = "gpt-4o-mini"
+TEMPERATURE = 0.2
+
+# Raw LLM responses keyed on SHA-256 of the prompt; survives restarts and sessions.
+LLM_CACHE_PATH = os.path.join(os.path.dirname(__file__), ".cache", "llm_responses")
+# In-memory reasons cache: lifetime and size cap.
+REASONS_TTL_SECONDS = 3600
+REASONS_MEMO_MAX = 256
+
+# Compiled once; query helpers below expect text already passed through normalize_text.
+_WS = re.compile(r"\s+")
+# Examples: "₹50,000", "under 50000", "rs 2000", "rupees 1500"
+_BUDGET = re.compile(r"(₹|rs\.?|rupees?)\s*\d[\d,]*|under\s*\d[\d,]*")
+
+class _SlugTable(dict):
+    """str.translate table: a-z/0-9 map to themselves, every other code point to "-"."""
+    def __missing__(self, key: int) -> str:
+        return "-"
+
+_SLUG_TABLE = _SlugTable({ord(c): c for c in string.ascii_lowercase + string.digits})
+
 @st.cache_data(show_spinner=False)
 def load_json(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
 
 def _data_path(*parts: str) -> str:
     base_dir = os.path.dirname(__file__)
@@ -40,30 +83,127 @@ def load_datasets() -> Tuple[Dict, Dict]:
     return categories, websites
 
 def normalize_text(s: str) -> str:
-    return re.sub(r"\s+", " ", s.lower()).strip()
+    return _WS.sub(" ", s.lower()).strip()
+
+def lowercase_keywords(categories: Dict) -> Dict:
+    """Copy of categories.json with every keyword lowercased (and empties dropped), done once at load."""
+    return {
+        cat: {**cfg, "keywords": [kw.lower() for kw in cfg.get("keywords", []) if kw]}
+        for cat, cfg in categories.items()
+    }
 
-def extract_category(query: str, categories: Dict) -> Optional[str]:
+def compile_category_pattern(categories: Dict) -> Tuple[Optional[Pattern], Dict[str, List[str]]]:
+    """
+    Compile every keyword into ONE pattern so a query is scanned in a single pass.
+    Expects lowercase_keywords() output.
+    The alternation sits in a lookahead, so matches may overlap ("t-shirt" and its "shirt").
+    Only the longest keyword is reported per start position, so each keyword also maps to
+    the shorter keywords that are whole-word prefixes of it ("gaming laptop" -> ["gaming"]).
+    Returns (pattern, keyword -> implied prefix keywords); pattern is None if there are no keywords.
+    """
+    keywords = sorted({kw for cfg in categories.values() for kw in cfg.get("keywords", [])}, key=len, reverse=True)
+    if not keywords:
+        return None, {}
+    prefixes: Dict[str, List[str]] = {}
+    for kw in keywords:
+        prefixes[kw] = [
+            p for p in keywords
+            if len(p) < len(kw) and kw.startswith(p) and _is_word_char(p[-1]) != _is_word_char(kw[len(p)])
+        ]
+    pattern = re.compile(r"\b(?=(" + "|".join(re.escape(kw) for kw in keywords) + r")\b)")
+    return pattern, prefixes
+
+def build_keyword_automaton(categories: Dict):
+    """
+    Build an Aho-Corasick automaton over every category keyword.
+    Expects lowercase_keywords() output.
+    Returns None if pyahocorasick is unavailable or there are no keywords.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for cfg in categories.values():
+        for kw in cfg.get("keywords", []):
+            automaton.add_word(kw, kw)
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+def match_keywords(automaton, q: str) -> Set[str]:
+    """Distinct keywords found in q as whole words (same boundaries as the regex path), in one pass."""
+    hits: Set[str] = set()
+    for end, kw in automaton.iter(q):
+        start = end - len(kw) + 1
+        if start > 0 and _is_word_char(q[start - 1]) and _is_word_char(kw[0]):
+            continue
+        if end + 1 < len(q) and _is_word_char(q[end + 1]) and _is_word_char(kw[-1]):
+            continue
+        hits.add(kw)
+    return hits
+
+def match_keywords_regex(category_pattern: Tuple[Optional[Pattern], Dict[str, List[str]]], q: str) -> Set[str]:
+    """Distinct keywords found in q as whole words, using the compiled category pattern."""
+    pattern, prefixes = category_pattern
+    hits: Set[str] = set()
+    if pattern is None:
+        return hits
+    for m in pattern.finditer(q):
+        kw = m.group(1)
+        hits.add(kw)
+        hits.update(prefixes[kw])
+    return hits
+
+@st.cache_resource(show_spinner=False)
+def bootstrap() -> SimpleNamespace:
+    """
+    Load datasets and build derived lookups once per process instead of on every rerun.
+    The returned object is shared across sessions; treat it as read-only.
     """
-    Simple keyword-based category extraction.
-    Returns the best matching category name or None if not found.
+    categories, websites = load_datasets()
+    categories = lowercase_keywords(categories)
+    # Resolve each site's template domain once here rather than on every render.
+    for sites in websites.values():
+        for site in sites:
+            site["_domain"] = site_domain(site.get("url", ""))
+    return SimpleNamespace(
+        categories=categories,
+        websites=websites,
+        category_pattern=compile_category_pattern(categories),
+        keyword_automaton=build_keyword_automaton(categories),
+    )
+
+def extract_category(
+    q: str,
+    categories: Dict,
+    category_pattern: Tuple[Optional[Pattern], Dict[str, List[str]]],
+    automaton=None,
+) -> Optional[str]:
     """
-    q = normalize_text(query)
+    Simple keyword-based category extraction on a normalized query.
+    Finds matching keywords with the Aho-Corasick automaton when available, else the
+    compiled pattern; a category scores one point per distinct keyword matched.
+    Returns the best matching category name (earlier category wins ties) or None if not found.
+    """
+    hits = match_keywords(automaton, q) if automaton is not None else match_keywords_regex(category_pattern, q)
+    if not hits:
+        return None
     best_cat = None
     best_score = 0
     for cat, cfg in categories.items():
-        kws = cfg.get("keywords", [])
-        score = sum(1 for kw in kws if re.search(rf"\b{re.escape(kw.lower())}\b", q))
+        score = sum(1 for kw in cfg.get("keywords", []) if kw in hits)
         if score > best_score:
             best_cat, best_score = cat, score
-    return best_cat if best_score > 0 else None
+    return best_cat
 
-def budget_present(query: str) -> bool:
-    q = normalize_text(query)
-    # Examples: "₹50,000", "under 50000", "rs 2000", "rupees 1500"
-    return bool(re.search(r"(₹|rs\.?|rupees?)\s*\d[\d,]*|under\s*\d[\d,]*", q))
+def budget_present(q: str) -> bool:
+    return bool(_BUDGET.search(q))
 
-def deterministic_reason(site_name: str, category: str, query: str) -> str:
-    has_budget = budget_present(query)
+def deterministic_reason(site_name: str, category: str, q_norm: str) -> str:
+    has_budget = budget_present(q_norm)
     base = f"{site_name} is a reliable place to browse {category} with broad selection, trusted sellers, and convenient delivery."
     if category == "electronics":
         base = f"{site_name} offers a strong range of electronics with specs filters, trusted warranties, and quick delivery options."
@@ -75,87 +215,288 @@ def deterministic_reason(site_name: str, category: str, query: str) -> str:
         base += " Use price filters and deals to stay within your budget."
     return base
 
-def make_llm():
+@st.cache_resource(show_spinner=False)
+def get_llm():
+    """LangChain chat model for the per-site path, one per process (reuses its HTTP pool)."""
     api_key = os.environ.get("OPENAI_API_KEY")
-    if not _lc_available or not api_key:
+    if not api_key:
         return None
     try:
-        # gpt-4o-mini is a good balance of cost/quality; adjust as you like.
-        return ChatOpenAI(model="gpt-4o-mini", temperature=0.2, api_key=api_key)
+        from langchain_openai import ChatOpenAI  # Requires: langchain-openai
+        return ChatOpenAI(model=DEFAULT_MODEL, temperature=TEMPERATURE, api_key=api_key, streaming=True)
     except Exception:
         return None
 
-def reason_with_llm(llm, query: str, category: str, site_name: str, site_url: str) -> str:
+@st.cache_resource(show_spinner=False)
+def get_openai_client():
+    """One OpenAI client per process, so its HTTP connection pool is reused across submits."""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    try:
+        from openai import OpenAI  # Requires: openai
+        return OpenAI(api_key=api_key)
+    except Exception:
+        return None
+
+REASONS_SYSTEM = "You are a helpful shopping assistant for India."
+
+REASONS_PROMPT = """User query: "{query}"
+Category: "{category}"
+
+For EACH website below, write ONE short, specific sentence (max 25 words) explaining why it is a good place to buy.
+Be factual. Don't invent prices or stock. If budget is mentioned, suggest using filters/deals.
+
+Websites:
+{website_list}
+
+Output rules:
+- Return a VALID JSON object only, no markdown or extra text.
+- Keys MUST be exactly the website names from the list above.
+- Values are the one-sentence reasons.
+
+Example format:
+{{
+  "Amazon": "Reason here.",
+  "Flipkart": "Reason here."
+}}"""
+
+def _prompt_key(prompt_text: str) -> str:
+    return hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()
+
+@st.cache_resource(show_spinner=False)
+def disk_cache_lock() -> threading.Lock:
+    """Process-wide lock for the shelve db; dbm files are not safe for concurrent writers."""
+    return threading.Lock()
+
+def disk_cache_get(prompt_text: str) -> Optional[str]:
+    try:
+        with disk_cache_lock(), shelve.open(LLM_CACHE_PATH, flag="r") as db:
+            return db.get(_prompt_key(prompt_text))
+    except Exception:
+        return None
+
+def disk_cache_set(prompt_text: str, response: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(LLM_CACHE_PATH), exist_ok=True)
+        with disk_cache_lock(), shelve.open(LLM_CACHE_PATH) as db:
+            db[_prompt_key(prompt_text)] = response
+    except Exception:
+        pass
+
+# A completed "key": "value" pair inside a (possibly still streaming) JSON object
+JSON_PAIR_RE = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+def parse_partial_reasons(buffer: str, allowed: set) -> Dict[str, str]:
+    """Reasons already complete in a partially streamed JSON object, limited to allowed names."""
+    reasons: Dict[str, str] = {}
+    for key, value in JSON_PAIR_RE.findall(buffer):
+        try:
+            name, reason = json.loads(f'"{key}"'), json.loads(f'"{value}"')
+        except json.JSONDecodeError:
+            continue
+        if name in allowed:
+            reasons[name] = reason
+    return reasons
+
+def reasons_with_llm(
+    client, query: str, category: str, sites: List[Dict[str, str]], on_partial: Optional[Callable] = None
+) -> Dict[str, str]:
     """
-    Generate a single short sentence reason with LangChain + OpenAI.
-    Falls back to deterministic_reason on any error.
+    Generate short reasons for ALL sites in one OpenAI chat completion (JSON object mode).
+    Each site dict needs "name" and "url" (optionally "strengths").
+    With on_partial, the response is streamed and on_partial({name: reason}) is called
+    whenever another reason completes.
+    Returns {site_name: reason} for the sites the model covered; raises on any error.
     """
-    try:
-        prompt = (
-            "You are a helpful shopping assistant for India. "
-            "Given a user shopping query, a product category, and a website, write ONE short, specific sentence "
-            "(max 25 words) explaining why the site is a good place to buy. "
-            "Be factual. Don't invent prices or stock. If budget is mentioned, suggest using filters/deals.\n\n"
-            f"User query: {query}\n"
-            f"Category: {category}\n"
-            f"Website: {site_name} ({site_url})\n"
-            "Answer:"
+    website_lines = []
+    for site in sites:
+        strengths = ", ".join(site.get("strengths", [])) or "general strengths"
+        website_lines.append(f"- {site['name']} ({site['url']}): {strengths}")
+
+    user_msg = REASONS_PROMPT.format(query=query, category=category, website_list="\n".join(website_lines))
+    prompt_text = f"{REASONS_SYSTEM}\n{user_msg}"
+    allowed = {site["name"] for site in sites}
+
+    raw = disk_cache_get(prompt_text)
+    from_disk = raw is not None
+    if raw is None:
+        response = client.chat.completions.create(
+            model=DEFAULT_MODEL,
+            temperature=TEMPERATURE,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": REASONS_SYSTEM},
+                {"role": "user", "content": user_msg},
+            ],
+            stream=on_partial is not None,
         )
-        # ChatOpenAI.invoke accepts a string prompt and returns an object with .content
-        result = llm.invoke(prompt)
-        text = (result.content or "").strip()
-        if not text:
-            raise ValueError("Empty LLM response")
-        # Keep it to one sentence; trim if overly long.
-        text = re.split(r"[\.!?]", text)[0].strip()
-        return text + "."
-    except Exception:
-        return deterministic_reason(site_name, category, query)
+        if on_partial is None:
+            raw = response.choices[0].message.content or ""
+        else:
+            raw, shown = "", 0
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                raw += chunk.choices[0].delta.content or ""
+                partial = parse_partial_reasons(raw, allowed)
+                if len(partial) > shown:
+                    shown = len(partial)
+                    on_partial(partial)
+
+    parsed = _json_loads(raw)
+    if not isinstance(parsed, dict):
+        raise ValueError("Model did not return a JSON object")
+    reasons = {k: str(v).strip() for k, v in parsed.items() if k in allowed and str(v).strip()}
+    if not from_disk:
+        disk_cache_set(prompt_text, raw)
+    return reasons
+
+SITE_REASON_PROMPT = (
+    "You are a helpful shopping assistant for India. "
+    "Given a user shopping query, a product category, and a website, write ONE short, specific sentence "
+    "(max 25 words) explaining why the site is a good place to buy. "
+    "Be factual. Don't invent prices or stock. If budget is mentioned, suggest using filters/deals.\n\n"
+    "User query: {query}\n"
+    "Category: {category}\n"
+    "Website: {name} ({url})\n"
+    "Answer:"
+)
 
-def to_slug(s: str) -> str:
-    s = normalize_text(s)
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    s = re.sub(r"-{2,}", "-", s).strip("-")
-    return s or "search"
+async def _stream_site_reasons(chain, pending, on_partial: Callable) -> list:
+    """Stream all pending per-site prompts concurrently, reporting each site's text as it grows."""
+    async def _one(name: str, inputs: Dict[str, str]) -> str:
+        buf = ""
+        async for chunk in chain.astream(inputs):
+            buf += chunk
+            on_partial({name: buf})
+        return buf
+
+    return await asyncio.gather(*[_one(name, inputs) for name, _, inputs in pending], return_exceptions=True)
 
-def build_deep_link(site_name: str, base_url: str, query: str, category: str) -> str:
+def reasons_with_llm_per_site(
+    llm, query: str, category: str, sites: List[Dict[str, str]], on_partial: Optional[Callable] = None
+) -> Dict[str, str]:
     """
-    Build a deep search URL per site so users land on relevant results, not homepages.
-    Includes Myntra's slug + rawQuery + p=1 pattern as requested.
+    Generate one reason per site with a separate prompt each, sent concurrently via
+    chain.abatch so wall time is roughly one round-trip instead of N.
+    With on_partial, each call is streamed instead and on_partial({name: text_so_far}) is called per chunk.
+    Returns {site_name: reason} for the calls that succeeded; raises if none did.
     """
-    host = urlparse(base_url).netloc.lower()
-    q_norm = normalize_text(query)
-    q_enc = quote(q_norm)
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
 
-    # Electronics
-    if "amazon.in" in host:
-        if site_name.lower().startswith("amazon fashion") or category == "fashion":
-            return f"https://www.amazon.in/s?k={q_enc}&i=apparel"
-        return f"https://www.amazon.in/s?k={q_enc}"
-    if "flipkart.com" in host:
-        return f"https://www.flipkart.com/search?q={q_enc}"
-    if "croma.com" in host:
-        return f"https://www.croma.com/searchB?q={q_enc}"
-    if "reliancedigital.in" in host:
-        return f"https://www.reliancedigital.in/search?q={q_enc}"
+    prompt = ChatPromptTemplate.from_template(SITE_REASON_PROMPT)
+    reasons: Dict[str, str] = {}
+    pending = []  # (site_name, prompt_text, inputs) not found on disk
+    for site in sites:
+        inputs = {"query": query, "category": category, "name": site["name"], "url": site["url"]}
+        prompt_text = prompt.format(**inputs)
+        cached = disk_cache_get(prompt_text)
+        if cached:
+            reasons[site["name"]] = cached
+        else:
+            pending.append((site["name"], prompt_text, inputs))
+
+    if pending:
+        chain = prompt | llm | StrOutputParser()
+        # Streamlit runs the script synchronously, so drive the event loop here.
+        if on_partial is None:
+            outputs = asyncio.run(chain.abatch([p[2] for p in pending], return_exceptions=True))
+        else:
+            outputs = asyncio.run(_stream_site_reasons(chain, pending, on_partial))
+        for (name, prompt_text, _), out in zip(pending, outputs):
+            text = out.strip() if isinstance(out, str) else ""
+            if text:
+                reasons[name] = text
+                disk_cache_set(prompt_text, text)
+
+    if not reasons:
+        raise RuntimeError("No LLM reasons generated")
+    return reasons
+
+@st.cache_resource(show_spinner=False)
+def reasons_memo() -> Tuple[Dict[tuple, Tuple[float, Dict[str, str]]], threading.Lock]:
+    """
+    Process-wide in-memory reasons cache: {(query_norm, category, sites_key, per_site): (stored_at, reasons)}.
+    A plain dict, not st.cache_data: reasons stream to the page while generated, and
+    Streamlit calls inside a cache_data function break its replay on cache hits.
+    Shared by all session threads, so every access goes through the returned lock.
+    """
+    return {}, threading.Lock()
 
-    # Fashion
-    if "myntra.com" in host:
-        slug = to_slug(q_norm)
-        return f"https://www.myntra.com/{slug}?rawQuery={q_enc}&p=1"
-    if "ajio.com" in host:
-        return f"https://www.ajio.com/search/?text={q_enc}"
+def memo_get(key: tuple) -> Optional[Dict[str, str]]:
+    memo, lock = reasons_memo()
+    with lock:
+        entry = memo.get(key)
+    if entry is None or time.time() - entry[0] > REASONS_TTL_SECONDS:
+        return None
+    return dict(entry[1])
+
+def memo_set(key: tuple, reasons: Dict[str, str]) -> None:
+    memo, lock = reasons_memo()
+    with lock:
+        memo[key] = (time.time(), dict(reasons))
+        if len(memo) > REASONS_MEMO_MAX:
+            memo.pop(min(memo, key=lambda k: memo[k][0]), None)
 
+def to_slug(s: str) -> str:
+    # One C-level pass to map characters, then drop the empty runs between dashes.
+    s = "-".join(part for part in s.translate(_SLUG_TABLE).split("-") if part)
+    return s or "search"
+
+def site_domain(url: str) -> str:
+    """Registered domain used to pick a deep-link template, e.g. "https://www.amazon.in/fashion" -> "amazon.in"."""
+    host = urlparse(url).netloc.lower()
+    return ".".join(host.split(".")[-2:])
+
+# Deep search URL builders keyed on registered domain.
+# Each takes (q_enc, q_norm, category, site_name) and returns the search URL.
+DEEP_LINK_TEMPLATES: Dict[str, Callable[[str, str, str, str], str]] = {
+    # Electronics
+    "amazon.in": lambda q, qn, cat, name: (
+        f"https://www.amazon.in/s?k={q}&i=apparel"
+        if name.lower().startswith("amazon fashion") or cat == "fashion"
+        else f"https://www.amazon.in/s?k={q}"
+    ),
+    "flipkart.com": lambda q, qn, cat, name: f"https://www.flipkart.com/search?q={q}",
+    "croma.com": lambda q, qn, cat, name: f"https://www.croma.com/searchB?q={q}",
+    "reliancedigital.in": lambda q, qn, cat, name: f"https://www.reliancedigital.in/search?q={q}",
+    # Fashion
+    "myntra.com": lambda q, qn, cat, name: f"https://www.myntra.com/{to_slug(qn)}?rawQuery={q}&p=1",
+    "ajio.com": lambda q, qn, cat, name: f"https://www.ajio.com/search/?text={q}",
     # Furniture
-    if "pepperfry.com" in host:
-        return f"https://www.pepperfry.com/site_product/search?q={q_enc}"
-    if "ikea.com" in host:
-        return f"https://www.ikea.com/in/en/search/?q={q_enc}"
-    if "urbanladder.com" in host:
-        return f"https://www.urbanladder.com/products/search?keywords={q_enc}"
+    "pepperfry.com": lambda q, qn, cat, name: f"https://www.pepperfry.com/site_product/search?q={q}",
+    "ikea.com": lambda q, qn, cat, name: f"https://www.ikea.com/in/en/search/?q={q}",
+    "urbanladder.com": lambda q, qn, cat, name: f"https://www.urbanladder.com/products/search?keywords={q}",
+}
 
-    # Fallback
-    return base_url
+def build_deep_link(site: Dict[str, str], q_norm: str, category: str) -> str:
+    """
+    Build a deep search URL per site so users land on relevant results, not homepages.
+    Includes Myntra's slug + rawQuery + p=1 pattern as requested.
+    Uses the site's precomputed "_domain" (see bootstrap) when present.
+    """
+    base_url = site.get("url", "#")
+    domain = site.get("_domain") or site_domain(base_url)
+    template = DEEP_LINK_TEMPLATES.get(domain)
+    if template is None:
+        # Fallback
+        return base_url
+    return template(quote(q_norm), q_norm, category, site.get("name", "Website"))
+
+
+def render_site_list(sites: List[Dict[str, str]], reasons: Dict[str, str]) -> str:
+    """Markdown for all sites at once: a link bullet per site with its reason in italics below."""
+    lines = []
+    for site in sites:
+        line = f"- [{site['name']}]({site['url']})"
+        reason = reasons.get(site["name"], "").strip()
+        if reason:
+            # Two trailing spaces = hard line break inside the bullet
+            line += f"  \n  _{reason}_"
+        lines.append(line)
+    return "\n".join(lines)
 
 
 # ---------- Streamlit UI ----------
@@ -177,18 +518,19 @@ if submitted:
         st.stop()
 
     try:
-        categories, websites = load_datasets()
+        ctx = bootstrap()
     except Exception:
         st.error("Could not load local datasets. Please ensure categories.json and websites.json are present.")
         st.stop()
 
-    category = extract_category(query, categories)
+    q_norm = normalize_text(query)
+    category = extract_category(q_norm, ctx.categories, ctx.category_pattern, ctx.keyword_automaton)
 
     if not category:
         st.info("I couldn't recognize the product category. Try adding a few more details (e.g., 'laptop', 'sofa', or 'sneakers').")
         st.stop()
 
-    sites: List[Dict[str, str]] = websites.get(category, [])
+    sites: List[Dict[str, str]] = ctx.websites.get(category, [])
     if not sites:
         st.info(f"No websites configured for the '{category}' category yet. Please update websites.json.")
         st.stop()
@@ -196,18 +538,44 @@ if submitted:
     st.subheader("Assistant’s suggestion")
     st.write(f"For the category '{category}', here are some good places to start:")
 
-    llm = make_llm()
+    llm = get_llm() if PER_SITE_REASONS else get_openai_client()
 
-    # Display each site with deep link + concise reason
+    # Resolve deep links first so the LLM sees the same URLs the user will click
+    resolved = []
     for site in sites:
-        name = site.get("name", "Website")
-        base_url = site.get("url", "#")
-
-        deep_url = build_deep_link(name, base_url, query, category)  # use deep links
-        reason = reason_with_llm(llm, query, category, name, deep_url) if llm else deterministic_reason(name, category, query)
-
-        st.markdown(f"- [{name}]({deep_url})")
-        st.caption(reason)
+        deep_url = build_deep_link(site, q_norm, category)  # use deep links
+        resolved.append({**site, "name": site.get("name", "Website"), "url": deep_url})
+
+    # Links go out immediately as one markdown element; reasons fill in as the LLM streams
+    results = st.empty()
+    shown: Dict[str, str] = {}
+
+    def show_partial(partial: Dict[str, str]) -> None:
+        shown.update(partial)
+        results.markdown(render_site_list(resolved, shown))
+
+    show_partial({})
+
+    reasons: Dict[str, str] = {}
+    if llm:
+        # Memo keyed on the normalized query; the prompt gets the user's original text
+        memo_key = (q_norm, category, tuple(sorted(site["name"] for site in resolved)), PER_SITE_REASONS)
+        cached = memo_get(memo_key)
+        if cached is not None:
+            reasons = cached
+        else:
+            generate = reasons_with_llm_per_site if PER_SITE_REASONS else reasons_with_llm
+            try:
+                reasons = generate(llm, query, category, resolved, show_partial)
+                memo_set(memo_key, reasons)
+            except Exception:
+                reasons = {}
+    for site in resolved:
+        # Anything the LLM didn't cover (or everything, without an API key) gets a deterministic reason
+        reasons.setdefault(site["name"], deterministic_reason(site["name"], category, q_norm))
+
+    # Final concise reason per site
+    show_partial(reasons)
 
     st.divider()
     st.caption("Tip: You can expand categories and websites by editing the JSON files in streamlit-app/data.")